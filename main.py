@@ -13,11 +13,58 @@ Usage:
 """
 
 import os
-import json
 import argparse
 import sys
-import subprocess
 import time
+import traceback
+
+# The pipeline steps live in scripts/ and import each other as top-level modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+# Separator line for the start/end banners
+_BANNER = "=" * 50
+_START_BANNER = f"{_BANNER}\nSTARTING YOUTUBE NEWS AGGREGATOR PIPELINE\n{_BANNER}\n"
+_END_BANNER = f"\n{_BANNER}\nPIPELINE COMPLETED SUCCESSFULLY\n{_BANNER}\n"
+
+# Directory for pipeline artifacts
+OUTPUT_DIR = "output"
+LATEST_NEWS_FILE = os.path.join(OUTPUT_DIR, "latest_news.json")
+
+# Channels to fetch from
+CHANNELS = (
+    "UCupvZG-5ko_eiXAupbDfxWw",  # CNN
+    "UCXIJgqnII2ZOINSWNOGFThA",  # Fox News
+    "UCg40OxZ1GYh3u3jBntB6DLg",  # Forbes
+    "UCMpW4tdyZUid2Ka9_FuDDhQ",  # Handelsblatt
+    "UCcPcua2PF7hzik2TeOBx3uw"   # FAZ
+)
+
+# Quality keywords for scoring
+QUALITY_KEYWORDS = (
+    "economy", "market", "stocks", "finance", "business", "technology",
+    "politics", "policy", "health", "science", "education", "analysis",
+    "wirtschaft", "markt", "aktien", "finanzen", "technologie", "politik",
+    "gesundheit", "wissenschaft", "bildung", "analyse"
+)
+
+def validate_preconditions(args):
+    """
+    Check every required input up front, before any pipeline module is imported.
+    
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+    """
+    # Check for service account file
+    if not os.path.exists(args.service_account):
+        print(f"Error: Service account file not found at {args.service_account}")
+        sys.exit(1)
+    
+    # Without the fetch step, the update step needs results from a previous run
+    if args.skip_fetch and not args.skip_update and not os.path.exists(LATEST_NEWS_FILE):
+        print(f"Error: {LATEST_NEWS_FILE} not found. Run with --skip-update to skip this step.")
+        sys.exit(1)
 
 def main():
     parser = argparse.ArgumentParser(description="Run YouTube News Aggregator Pipeline")
@@ -25,68 +72,59 @@ def main():
     parser.add_argument("--skip-update", action="store_true", help="Skip the playlist update step")
     parser.add_argument("--service-account", default="config/service-account.json", 
                         help="Path to service account JSON key file")
+    parser.add_argument("--show-stats", action="store_true",
+                        help="Print playlist title and item count after the update (one extra API call)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="List every video added to the playlist")
     args = parser.parse_args()
+    validate_preconditions(args)
     
-    print("=" * 50)
-    print("STARTING YOUTUBE NEWS AGGREGATOR PIPELINE")
-    print("=" * 50)
+    # Pipeline modules are only loaded once the inputs are known to be valid
+    import fetch_videos
+    import update_news_playlist
+    from service_account_auth import get_youtube_client
     
-    # Check for service account file
-    if not os.path.exists(args.service_account):
-        print(f"Error: Service account file not found at {args.service_account}")
-        sys.exit(1)
-        
-    # Ensure output directory exists
-    os.makedirs("output", exist_ok=True)
+    sys.stdout.write(_START_BANNER)
+    
+    # Ensure output directory exists (skips the mkdir syscall when it's already there)
+    if not os.path.isdir(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+    
+    # Build one YouTube client and share it between both pipeline steps
+    youtube = None
+    if not (args.skip_fetch and args.skip_update):
+        try:
+            youtube = get_youtube_client(args.service_account)
+        except Exception as e:
+            print(f"Error creating YouTube client: {e}")
+            sys.exit(1)
     
     # Step 1: Fetch and score videos
     if not args.skip_fetch:
         print("\n[STEP 1/2] Fetching and scoring videos...")
         
-        # Define channels to fetch from
-        channels = [
-            "UCupvZG-5ko_eiXAupbDfxWw",  # CNN
-            "UCXIJgqnII2ZOINSWNOGFThA",  # Fox News
-            "UCg40OxZ1GYh3u3jBntB6DLg",  # Forbes
-            "UCMpW4tdyZUid2Ka9_FuDDhQ",  # Handelsblatt
-            "UCcPcua2PF7hzik2TeOBx3uw"   # FAZ
-        ]
-        
-        # Quality keywords for scoring
-        quality_keywords = [
-            "economy", "market", "stocks", "finance", "business", "technology",
-            "politics", "policy", "health", "science", "education", "analysis",
-            "wirtschaft", "markt", "aktien", "finanzen", "technologie", "politik",
-            "gesundheit", "wissenschaft", "bildung", "analyse"
-        ]
-        
         # Create config dictionary
         config = {
             "service_account_file": args.service_account,
-            "channels": channels,
+            "channels": CHANNELS,
             "days_back": 1,
             "max_results": 20,
             "max_videos_per_channel": 5,
-            "quality_keywords": quality_keywords,
-            "output_dir": "output/"
+            "quality_keywords": QUALITY_KEYWORDS,
+            "output_dir": OUTPUT_DIR
         }
         
-        # Save config to temporary file
-        with open("output/temp_config.json", 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
-        
         try:
-            # Run the fetch_videos.py script
-            print("Running fetch_videos.py...")
-            subprocess.run([sys.executable, "scripts/fetch_videos.py", 
-                           "--load-config", "output/temp_config.json"], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error running fetch_videos.py: {e}")
+            # Run the fetch step in-process
+            print("Running fetch_videos...")
+            videos = fetch_videos.run(config, youtube=youtube)
+        except Exception as e:
+            print(f"Error running fetch_videos: {e}")
+            traceback.print_exc()
+            sys.exit(1)
+        
+        if videos is None:
             sys.exit(1)
-        finally:
-            # Clean up temporary config file
-            if os.path.exists("output/temp_config.json"):
-                os.remove("output/temp_config.json")
     else:
         print("\n[STEP 1/2] Skipping fetch videos step...")
     
@@ -94,28 +132,38 @@ def main():
     if not args.skip_update:
         print("\n[STEP 2/2] Updating YouTube playlist...")
         
-        if not os.path.exists("output/latest_news.json"):
-            print("Error: output/latest_news.json not found. Run with --skip-update to skip this step.")
+        if not os.path.exists(LATEST_NEWS_FILE):
+            print(f"Error: {LATEST_NEWS_FILE} not found. Run with --skip-update to skip this step.")
             sys.exit(1)
         
         try:
-            # Run the update_news_playlist.py script
-            print("Running update_news_playlist.py...")
-            subprocess.run([sys.executable, "scripts/update_news_playlist.py", 
-                           "--json-file", "output/latest_news.json",
-                           "--service-account", args.service_account], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error running update_news_playlist.py: {e}")
+            # Run the playlist update step in-process
+            print("Running update_news_playlist...")
+            success = update_news_playlist.update_news_playlist(
+                json_file=LATEST_NEWS_FILE,
+                service_account_file=args.service_account,
+                youtube=youtube,
+                show_stats=args.show_stats,
+                verbose=args.verbose
+            )
+        except Exception as e:
+            print(f"Error running update_news_playlist: {e}")
+            traceback.print_exc()
+            sys.exit(1)
+        
+        if not success:
             sys.exit(1)
     else:
         print("\n[STEP 2/2] Skipping playlist update step...")
     
-    print("\n" + "=" * 50)
-    print("PIPELINE COMPLETED SUCCESSFULLY")
-    print("=" * 50)
+    # Release the client's connections now rather than during interpreter teardown
+    if youtube is not None:
+        youtube.close()
+    
+    sys.stdout.write(_END_BANNER)
 
 if __name__ == "__main__":
-    start_time = time.time()
+    start_time = time.perf_counter()
     main()
-    elapsed_time = time.time() - start_time
+    elapsed_time = time.perf_counter() - start_time
     print(f"\nTotal execution time: {elapsed_time:.2f} seconds")
\ No newline at end of file
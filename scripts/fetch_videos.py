@@ -5,15 +5,51 @@ Integrated YouTube News Aggregator with Scoring
 """
 
 import os
+import re
+import sys
 import json
 import argparse
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import time
 from googleapiclient.errors import HttpError
 
+# orjson is optional; fall back to the standard library when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import the VideoScoreCalculator directly
 from score_calculator import VideoScoreCalculator, apply_scores_to_videos
-from service_account_auth import get_youtube_client
+from service_account_auth import API_NUM_RETRIES, get_authorized_http, get_youtube_client
+
+# ISO 8601 duration as returned by the API (e.g. "PT1H2M3S", "P1DT2H", "P0D")
+_DURATION_RE = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+# Opening phrases of a FAZ Frühdenker description
+_FRUEHDENKER_DESCRIPTION_RE = re.compile(r'das wichtigste|die nachrichten', re.IGNORECASE)
+
+# FAZ podcast names that mark a video as a podcast on their own
+FAZ_PODCAST_KEYWORDS = (
+    'podcast für deutschland',
+    'f.a.z. digitalwirtschaft',
+    'f.a.z. einspruch',
+    'f.a.z. gesundheit',
+    'f.a.z. finanzen & immobilien'
+)
+
+# Title prefixes (followed by a colon) that indicate an interview/expert format
+FAZ_EXPERT_KEYWORDS = ('interview', 'gespräch', 'experte', 'analyse')
+
+# Compiled once so each title is scanned in a single pass
+_FAZ_PODCAST_RE = re.compile('|'.join(re.escape(keyword) for keyword in FAZ_PODCAST_KEYWORDS))
+_FAZ_EXPERT_RE = re.compile('(?:' + '|'.join(re.escape(expert) for expert in FAZ_EXPERT_KEYWORDS) + '):')
+
+# Channel groups (sets, since they are checked once per collected video)
+US_CHANNELS = frozenset({"UCupvZG-5ko_eiXAupbDfxWw", "UCXIJgqnII2ZOINSWNOGFThA", "UCg40OxZ1GYh3u3jBntB6DLg"})  # CNN, Fox News, Forbes
+GERMAN_CHANNELS = frozenset({"UCMpW4tdyZUid2Ka9_FuDDhQ", "UCcPcua2PF7hzik2TeOBx3uw"})  # Handelsblatt, FAZ
 
 def is_faz_fruehdenker(video_info):
     """
@@ -33,20 +69,7 @@ def is_faz_fruehdenker(video_info):
     """
     title = video_info.get('title', '')
     
-    # Get published time from ISO format
-    published_at = video_info.get('published_at', '')
-    if published_at:
-        try:
-            published_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-            hour = published_time.hour
-            
-            # Check time (5-7 AM)
-            if not (5 <= hour <= 7):
-                return False
-        except (ValueError, TypeError):
-            return False
-    
-    # Check for bullet points in title
+    # Check for bullet points in title (cheap checks first; the timestamp is parsed last)
     if '•' not in title:
         return False
     
@@ -56,13 +79,23 @@ def is_faz_fruehdenker(video_info):
     if not (8 <= duration_min <= 12):  # Slightly expanded range for flexibility
         return False
     
-    # Check description
-    description = video_info.get('description', '').lower()
-    description_start = description[:30].lower()
-    if not (description_start.startswith('das wichtigste') or 
-            description_start.startswith('die nachrichten')):
+    # Check description (anchored match, so only the start of the text is examined)
+    if not _FRUEHDENKER_DESCRIPTION_RE.match(video_info.get('description', '')):
         return False
     
+    # Get published hour; ISO 8601 timestamps ("YYYY-MM-DDTHH:MM:SSZ") keep it at a
+    # fixed offset, so it is sliced out instead of parsing the whole timestamp
+    published_at = video_info.get('published_at', '')
+    if published_at:
+        try:
+            hour = int(published_at[11:13])
+            
+            # Check time (5-7 AM)
+            if not (5 <= hour <= 7):
+                return False
+        except (ValueError, TypeError):
+            return False
+    
     # All criteria met
     return True
 
@@ -83,17 +116,8 @@ def is_faz_podcast(video_info):
     """
     title = video_info.get('title', '').lower()
     
-    # Check for podcast keywords
-    podcast_keywords = [
-        'podcast für deutschland',
-        'f.a.z. digitalwirtschaft',
-        'f.a.z. einspruch',
-        'f.a.z. gesundheit',
-        'f.a.z. finanzen & immobilien'
-    ]
-    
     # Explicit podcast in title
-    if any(keyword in title for keyword in podcast_keywords):
+    if _FAZ_PODCAST_RE.search(title):
         return True
     
     # Check for interview format with longer duration
@@ -106,7 +130,7 @@ def is_faz_podcast(video_info):
     
     # Format criteria
     has_interview_format = (':' in title or '?' in title)
-    has_expert_format = any(expert + ':' in title.replace(' ', '') for expert in ['interview', 'gespräch', 'experte', 'analyse'])
+    has_expert_format = _FAZ_EXPERT_RE.search(title.replace(' ', '')) is not None
     
     # Title format checks
     podcast_format = False
@@ -121,50 +145,121 @@ def is_faz_podcast(video_info):
     
     return has_interview_format or has_expert_format or podcast_format
 
+def is_handelsblatt_koch(video_info):
+    """
+    Check if a Handelsblatt video features Koch
+    
+    Only needs title and description, so it can run before video details are fetched.
+    
+    Args:
+        video_info (dict): Dictionary containing video metadata
+        
+    Returns:
+        bool: True if Koch is mentioned in the title or description
+    """
+    # The (usually much longer) description is only lowercased if the title doesn't match
+    return ('koch' in video_info.get('title', '').lower()
+            or 'koch' in video_info.get('description', '').lower())
+
 class YouTubeNewsAggregator:
-    def __init__(self, service_account_file=None):
+    def __init__(self, service_account_file=None, max_workers=8, youtube=None):
         """
         Initialize the YouTube News Aggregator.
         
         Args:
             service_account_file (str, optional): Path to the service account JSON key file
+            max_workers (int, optional): Maximum number of requests made concurrently
+            youtube (optional): Existing YouTube API client to reuse (left open by close())
         """
         self.service_account_file = service_account_file
-        self.youtube = None
+        self.max_workers = max_workers
+        
+        # Worker pool and per-thread transports, created on first use and released by close()
+        self._executor = None
+        self._worker_http = []
+        self._local = threading.local()
+        # The creating thread uses the client's own transport
+        self._local.http = None
         
         # Connect to YouTube API with service account
         if service_account_file:
-            self.youtube = get_youtube_client(service_account_file)
+            self._owns_client = youtube is None
+            self.youtube = youtube or get_youtube_client(service_account_file)
         else:
             raise ValueError("Service account file must be provided")
     
-    def get_channel_uploads_playlist(self, channel_id):
+    @property
+    def executor(self):
+        """
+        Thread pool shared by all concurrent fetches of this aggregator.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def _http(self):
+        """
+        Transport for requests executed on the current thread.
+        
+        The httplib2 transport is not thread-safe, so each worker thread gets its
+        own authorized transport on first use; None means the client's default.
+        """
+        try:
+            return self._local.http
+        except AttributeError:
+            http = get_authorized_http(self.service_account_file)
+            self._local.http = http
+            self._worker_http.append(http)
+            return http
+    
+    def close(self):
+        """
+        Shut down the worker pool and close the connections opened by the aggregator.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        
+        for http in self._worker_http:
+            http.http.close()
+        self._worker_http.clear()
+        
+        if self._owns_client:
+            self.youtube.close()
+    
+    def get_channel_uploads_playlists(self, channel_ids):
         """
-        Get the uploads playlist ID for a YouTube channel.
+        Get the uploads playlist IDs for several YouTube channels.
         
         Args:
-            channel_id (str): YouTube channel ID
+            channel_ids (list): List of YouTube channel IDs
             
         Returns:
-            str: Uploads playlist ID or None if not found
+            dict: Mapping of channel ID to uploads playlist ID (channels without one are omitted)
         """
-        try:
-            # Get channel details
-            channel_response = self.youtube.channels().list(
-                part="contentDetails",
-                id=channel_id
-            ).execute()
-            
-            # Extract uploads playlist ID
-            if "items" in channel_response and channel_response["items"]:
-                uploads_playlist_id = channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-                return uploads_playlist_id
+        uploads_playlists = {}
+        
+        # Process channels in batches of 50 (API limit for comma-separated IDs)
+        for i in range(0, len(channel_ids), 50):
+            batch = channel_ids[i:i+50]
             
-            return None
+            try:
+                # Get channel details
+                channel_response = self.youtube.channels().list(
+                    part="contentDetails",
+                    id=",".join(batch),
+                    maxResults=50,
+                    fields="items(id,contentDetails/relatedPlaylists/uploads)"
+                ).execute(http=self._http(), num_retries=API_NUM_RETRIES)
+                
+                # Extract uploads playlist IDs
+                for item in channel_response.get("items", []):
+                    uploads_playlists[item["id"]] = item["contentDetails"]["relatedPlaylists"]["uploads"]
             
-        except HttpError as e:
-            print(f"Error getting uploads playlist for channel {channel_id}: {e}")
-            return None
+            except HttpError as e:
+                print(f"Error getting uploads playlists for channels {', '.join(batch)}: {e}")
+        
+        return uploads_playlists
     
     def get_videos_from_playlist(self, playlist_id, published_after=None, max_results=50):
         """
@@ -181,35 +276,46 @@ class YouTubeNewsAggregator:
         videos = []
         
         try:
-            # Convert datetime to RFC 3339 format for the API
+            # publishedAt is always UTC in the fixed "YYYY-MM-DDTHH:MM:SSZ" form, so
+            # formatting the cutoff the same way lets us compare plain strings
+            # instead of parsing every timestamp
             published_after_str = None
             if published_after:
-                published_after_str = published_after.isoformat() + "Z"
+                published_after_str = published_after.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
             
-            # Get videos from playlist
-            request = self.youtube.playlistItems().list(
+            # Get videos from playlist (resource resolved once for all pages)
+            playlist_items = self.youtube.playlistItems()
+            request = playlist_items.list(
                 part="snippet,contentDetails",
                 playlistId=playlist_id,
-                maxResults=min(50, max_results)  # API limit is 50 per request
+                maxResults=min(50, max_results),  # API limit is 50 per request
+                # Only what we read below; nextPageToken is needed for list_next
+                fields="nextPageToken,items(contentDetails/videoId,"
+                       "snippet(publishedAt,title,description,channelId,channelTitle,"
+                       "thumbnails(high/url,default/url)))"
             )
             
             # For storing videos that meet the criteria
             total_retrieved = 0
             
             while request and total_retrieved < max_results:
-                response = request.execute()
+                response = request.execute(http=self._http(), num_retries=API_NUM_RETRIES)
+                
+                # Whether this page had any video newer than the cutoff
+                page_has_recent = False
                 
                 # Process each video
                 for item in response.get("items", []):
                     # Extract video details
                     video_id = item["contentDetails"]["videoId"]
                     published_at = item["snippet"]["publishedAt"]
-                    published_at_dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
                     
-                    # Skip videos published before the cutoff date
-                    if published_after and published_at_dt < published_after:
+                    # Skip videos older than the cutoff
+                    if published_after_str and published_at < published_after_str:
                         continue
                     
+                    page_has_recent = True
+                    
                     # Add video to the list
                     videos.append({
                         "id": video_id,
@@ -225,8 +331,14 @@ class YouTubeNewsAggregator:
                     if total_retrieved >= max_results:
                         break
                 
+                # Uploads playlists are roughly newest first, but premieres and
+                # scheduled uploads can break the order; only stop paging once a
+                # whole page is older than the cutoff
+                if published_after_str and not page_has_recent:
+                    break
+                
                 # Get next page of results
-                request = self.youtube.playlistItems().list_next(request, response)
+                request = playlist_items.list_next(request, response)
             
             return videos
             
@@ -246,63 +358,84 @@ class YouTubeNewsAggregator:
         """
         video_details = {}
         
-        # Process videos in batches of 50 (API limit)
-        for i in range(0, len(video_ids), 50):
-            batch = video_ids[i:i+50]
+        # Reference time for hours_since_published, shared by all videos
+        now = datetime.now().astimezone()
+        
+        # Process videos in batches of 50 (API limit); batches are independent, so request them concurrently
+        batches = [video_ids[i:i+50] for i in range(0, len(video_ids), 50)]
+        for batch_details in self.executor.map(lambda batch: self._get_video_details_batch(batch, now), batches):
+            video_details.update(batch_details)
+        
+        return video_details
+    
+    def _get_video_details_batch(self, batch, now):
+        """
+        Get detailed information about up to 50 YouTube videos with a single request.
+        
+        Args:
+            batch (list): List of at most 50 YouTube video IDs
+            now (datetime): Reference time for hours_since_published
             
-            try:
-                # Get video details
-                response = self.youtube.videos().list(
-                    part="snippet,contentDetails,statistics",
-                    id=",".join(batch)
-                ).execute()
-                
-                # Process each video
-                for item in response.get("items", []):
-                    video_id = item["id"]
-                    
-                    # Extract duration in seconds
-                    duration = item["contentDetails"]["duration"]
-                    duration_seconds = self._parse_duration(duration)
-                    
-                    # Format duration for display (MM:SS)
-                    minutes = duration_seconds // 60
-                    seconds = duration_seconds % 60
-                    duration_formatted = f"{minutes}:{seconds:02d}"
-                    if minutes >= 60:
-                        hours = minutes // 60
-                        minutes = minutes % 60
-                        duration_formatted = f"{hours}:{minutes:02d}:{seconds:02d}"
-                    
-                    # Extract statistics
-                    statistics = item.get("statistics", {})
-                    view_count = int(statistics.get("viewCount", 0))
-                    like_count = int(statistics.get("likeCount", 0))
-                    comment_count = int(statistics.get("commentCount", 0))
-                    
-                    # Extract tags
-                    tags = item["snippet"].get("tags", [])
-                    
-                    # Calculate hours since published
-                    published_at = item["snippet"]["publishedAt"]
-                    published_at_dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                    hours_since_published = (datetime.now().astimezone() - published_at_dt).total_seconds() / 3600
-                    
-                    # Store details
-                    video_details[video_id] = {
-                        "duration_seconds": duration_seconds,
-                        "duration_formatted": duration_formatted,
-                        "view_count": view_count,
-                        "like_count": like_count,
-                        "comment_count": comment_count,
-                        "tags": tags,
-                        "hours_since_published": hours_since_published
-                    }
+        Returns:
+            dict: Dictionary mapping video IDs to their details
+        """
+        details = {}
+        
+        try:
+            # Get video details
+            response = self.youtube.videos().list(
+                part="snippet,contentDetails,statistics",
+                id=",".join(batch),
+                fields="items(id,snippet(publishedAt,tags),contentDetails/duration,"
+                       "statistics(viewCount,likeCount,commentCount))"
+            ).execute(http=self._http(), num_retries=API_NUM_RETRIES)
             
-            except HttpError as e:
-                print(f"Error getting video details: {e}")
+            # Process each video
+            for item in response.get("items", []):
+                video_id = item["id"]
+                
+                # Extract duration in seconds
+                duration = item["contentDetails"]["duration"]
+                duration_seconds = self._parse_duration(duration)
+                
+                # Format duration for display (MM:SS)
+                minutes = duration_seconds // 60
+                seconds = duration_seconds % 60
+                duration_formatted = f"{minutes}:{seconds:02d}"
+                if minutes >= 60:
+                    hours = minutes // 60
+                    minutes = minutes % 60
+                    duration_formatted = f"{hours}:{minutes:02d}:{seconds:02d}"
+                
+                # Extract statistics
+                statistics = item.get("statistics", {})
+                view_count = int(statistics.get("viewCount", 0))
+                like_count = int(statistics.get("likeCount", 0))
+                comment_count = int(statistics.get("commentCount", 0))
+                
+                # Extract tags
+                tags = item["snippet"].get("tags", [])
+                
+                # Calculate hours since published
+                published_at = item["snippet"]["publishedAt"]
+                published_at_dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+                hours_since_published = (now - published_at_dt).total_seconds() / 3600
+                
+                # Store details
+                details[video_id] = {
+                    "duration_seconds": duration_seconds,
+                    "duration_formatted": duration_formatted,
+                    "view_count": view_count,
+                    "like_count": like_count,
+                    "comment_count": comment_count,
+                    "tags": tags,
+                    "hours_since_published": hours_since_published
+                }
         
-        return video_details
+        except HttpError as e:
+            print(f"Error getting video details: {e}")
+        
+        return details
     
     def _parse_duration(self, duration_str):
         """
@@ -314,35 +447,43 @@ class YouTubeNewsAggregator:
         Returns:
             int: Duration in seconds
         """
-        seconds = 0
+        match = _DURATION_RE.match(duration_str)
+        if not match:
+            return 0
         
-        # Remove "PT" prefix
-        duration_str = duration_str[2:]
-        
-        # Extract hours, minutes, and seconds
-        hours_pos = duration_str.find("H")
-        minutes_pos = duration_str.find("M")
-        seconds_pos = duration_str.find("S")
+        days, hours, minutes, seconds = (int(group or 0) for group in match.groups())
+        return days * 86400 + hours * 3600 + minutes * 60 + seconds
+    
+    def _get_channel_videos(self, channel_id, uploads_playlist_id, published_after, max_results):
+        """
+        Get recent videos from a single YouTube channel.
         
-        if hours_pos != -1:
-            hours = int(duration_str[:hours_pos])
-            seconds += hours * 3600
-            duration_str = duration_str[hours_pos+1:]
-            minutes_pos = duration_str.find("M")
-            seconds_pos = duration_str.find("S")
+        Args:
+            channel_id (str): YouTube channel ID
+            uploads_playlist_id (str): Uploads playlist ID of the channel, or None if unknown
+            published_after (datetime): Only include videos published after this date
+            max_results (int): Maximum number of videos to retrieve
+            
+        Returns:
+            list: List of video items
+        """
+        print(f"Processing channel: {channel_id}")
         
-        if minutes_pos != -1:
-            minutes = int(duration_str[:minutes_pos])
-            seconds += minutes * 60
-            duration_str = duration_str[minutes_pos+1:]
-            seconds_pos = duration_str.find("S")
+        if not uploads_playlist_id:
+            print(f"Skipping channel {channel_id}: No uploads playlist found")
+            return []
         
-        if seconds_pos != -1:
-            seconds += int(duration_str[:seconds_pos])
+        # Get videos from the uploads playlist
+        channel_videos = self.get_videos_from_playlist(
+            uploads_playlist_id,
+            published_after=published_after,
+            max_results=max_results
+        )
         
-        return seconds
+        print(f"Found {len(channel_videos)} recent videos from channel {channel_id}")
+        return channel_videos
     
-    def get_news_videos(self, channels, days_back=1, max_results=20):
+    def get_news_videos(self, channels, days_back=1, max_results=20, video_filter=None):
         """
         Get recent news videos from multiple YouTube channels.
         
@@ -350,6 +491,8 @@ class YouTubeNewsAggregator:
             channels (list): List of YouTube channel IDs
             days_back (int, optional): Number of days to look back for videos
             max_results (int, optional): Maximum number of videos per channel
+            video_filter (callable, optional): Predicate on snippet data; videos it rejects
+                are dropped before their details are requested
             
         Returns:
             list: List of news videos with details
@@ -359,28 +502,40 @@ class YouTubeNewsAggregator:
         # Calculate the cutoff date for recent videos
         published_after = datetime.now().astimezone() - timedelta(days=days_back)
         
-        for channel_id in channels:
-            print(f"Processing channel: {channel_id}")
-            
-            # Get uploads playlist ID for the channel
-            uploads_playlist_id = self.get_channel_uploads_playlist(channel_id)
-            if not uploads_playlist_id:
-                print(f"Skipping channel {channel_id}: No uploads playlist found")
-                continue
-            
-            # Get videos from the uploads playlist
-            channel_videos = self.get_videos_from_playlist(
-                uploads_playlist_id,
-                published_after=published_after,
-                max_results=max_results
-            )
-            
-            print(f"Found {len(channel_videos)} recent videos from channel {channel_id}")
+        # A channel's uploads playlist ID is its channel ID with the "UC" prefix replaced by "UU",
+        # so only IDs in another format need a channels.list lookup
+        uploads_playlists = {
+            channel_id: "UU" + channel_id[2:]
+            for channel_id in channels
+            if channel_id.startswith("UC")
+        }
+        other_channels = [channel_id for channel_id in channels if channel_id not in uploads_playlists]
+        if other_channels:
+            uploads_playlists.update(self.get_channel_uploads_playlists(other_channels))
+        
+        # Channels are independent and the work is network-bound, so fetch them concurrently
+        results = self.executor.map(
+            lambda channel_id: self._get_channel_videos(
+                channel_id,
+                uploads_playlists.get(channel_id),
+                published_after,
+                max_results
+            ),
+            channels
+        )
+        for channel_videos in results:
             all_videos.extend(channel_videos)
         
+        # Drop videos that can already be rejected, so they cost no videos.list quota
+        if video_filter is not None:
+            collected = len(all_videos)
+            all_videos = [video for video in all_videos if video_filter(video)]
+            print(f"Skipped details for {collected - len(all_videos)} videos rejected by the pre-filter")
+        
         # Get detailed information about the videos
         if all_videos:
-            video_ids = [video["id"] for video in all_videos]
+            # Deduplicate (order-preserving) so a video listed twice costs quota only once
+            video_ids = list(dict.fromkeys(video["id"] for video in all_videos))
             video_details = self.get_video_details(video_ids)
             
             # Add details to videos
@@ -392,13 +547,14 @@ class YouTubeNewsAggregator:
         return all_videos
 
 
-def run_news_aggregator(config, output_dir="output/"):
+def run_news_aggregator(config, output_dir="output/", youtube=None):
     """
     Run the YouTube News Aggregator.
     
     Args:
         config (dict): Configuration dictionary
         output_dir (str, optional): Output directory for results
+        youtube (optional): Existing YouTube API client to reuse
     """
     # Extract configuration parameters
     service_account_file = config.get("service_account_file")
@@ -407,54 +563,55 @@ def run_news_aggregator(config, output_dir="output/"):
     max_results = config.get("max_results", 20)
     quality_keywords = config.get("quality_keywords", [])
     
+    def needs_details(video):
+        # Handelsblatt selection only looks at title/description; other channels need
+        # duration and statistics, and videos from unknown channels are never selected
+        channel_id = video.get('channel_id')
+        if channel_id == "UCMpW4tdyZUid2Ka9_FuDDhQ":  # Handelsblatt
+            return is_handelsblatt_koch(video)
+        return channel_id in US_CHANNELS or channel_id in GERMAN_CHANNELS
+    
     # Initialize the aggregator
-    aggregator = YouTubeNewsAggregator(service_account_file=service_account_file)
+    aggregator = YouTubeNewsAggregator(service_account_file=service_account_file, youtube=youtube)
     
     # Get news videos
     print(f"Collecting videos from {len(channels)} channels...")
     print(f"- Looking back {days_back} days")
     print(f"- Max {max_results} videos per channel")
     
-    videos = aggregator.get_news_videos(
-        channels=channels,
-        days_back=days_back,
-        max_results=max_results
-    )
+    try:
+        videos = aggregator.get_news_videos(
+            channels=channels,
+            days_back=days_back,
+            max_results=max_results,
+            video_filter=needs_details
+        )
+    finally:
+        aggregator.close()
     
     print(f"Total videos collected: {len(videos)}")
     
-    # Separate videos by channel type
-    us_channels = ["UCupvZG-5ko_eiXAupbDfxWw", "UCXIJgqnII2ZOINSWNOGFThA", "UCg40OxZ1GYh3u3jBntB6DLg"]  # CNN, Fox News, Forbes
-    german_channels = ["UCMpW4tdyZUid2Ka9_FuDDhQ", "UCcPcua2PF7hzik2TeOBx3uw"]  # Handelsblatt, FAZ
-    
-    us_videos = [v for v in videos if v.get('channel_id') in us_channels]
-    german_videos = [v for v in videos if v.get('channel_id') in german_channels]
-    
-    print(f"US channel videos: {len(us_videos)}")
-    print(f"German channel videos: {len(german_videos)}")
-    
-    # Process US videos with Score Calculator
-    print("Applying scores to US channel videos...")
-    scored_us_videos = apply_scores_to_videos(us_videos, quality_keywords)
-    
-    # Sort US videos by total score (highest first)
-    scored_us_videos.sort(key=lambda x: x.get('total_score', 0), reverse=True)
-    
-    # Filter German videos based on specific criteria
+    # Split by channel type and apply the German criteria in a single pass
+    us_videos = []
     filtered_german_videos = []
+    german_count = 0
     
-    for video in german_videos:
+    for video in videos:
         channel_id = video.get('channel_id')
         
+        if channel_id in US_CHANNELS:
+            us_videos.append(video)
+            continue
+        if channel_id not in GERMAN_CHANNELS:
+            continue
+        german_count += 1
+        
         # Handelsblatt criteria (Podcasts and content with Koch)
         if channel_id == "UCMpW4tdyZUid2Ka9_FuDDhQ":  # Handelsblatt
-            title = video.get('title', '').lower()
-            description = video.get('description', '').lower()
-            
-            # Check for Koch content
-            if 'koch' in title or 'koch' in description:
-                filtered_german_videos.append(video)
-                print(f"✓ Handelsblatt Koch video: {video.get('title')}")
+            # Koch content was already checked by needs_details before the details
+            # were fetched, so every remaining Handelsblatt video qualifies
+            filtered_german_videos.append(video)
+            print(f"✓ Handelsblatt Koch video: {video.get('title')}")
         
         # FAZ criteria (Frühdenker videos and Podcasts)
         elif channel_id == "UCcPcua2PF7hzik2TeOBx3uw":  # FAZ
@@ -462,8 +619,17 @@ def run_news_aggregator(config, output_dir="output/"):
                 filtered_german_videos.append(video)
                 print(f"✓ FAZ selected video: {video.get('title')}")
     
+    print(f"US channel videos: {len(us_videos)}")
+    print(f"German channel videos: {german_count}")
     print(f"German videos after filtering: {len(filtered_german_videos)}")
     
+    # Process US videos with Score Calculator
+    print("Applying scores to US channel videos...")
+    scored_us_videos = apply_scores_to_videos(us_videos, quality_keywords)
+    
+    # Sort US videos by total score (highest first)
+    scored_us_videos.sort(key=lambda x: x.get('total_score', 0), reverse=True)
+    
     # Limit US videos to maximum 5 per channel
     max_videos_per_channel = config.get("max_videos_per_channel", 5)
     channel_counts = {}
@@ -471,12 +637,11 @@ def run_news_aggregator(config, output_dir="output/"):
     
     for video in scored_us_videos:
         channel_id = video.get('channel_id')
-        if channel_id not in channel_counts:
-            channel_counts[channel_id] = 0
+        count = channel_counts.get(channel_id, 0)
         
-        if channel_counts[channel_id] < max_videos_per_channel:
+        if count < max_videos_per_channel:
             filtered_us_videos.append(video)
-            channel_counts[channel_id] += 1
+            channel_counts[channel_id] = count + 1
     
     print(f"US videos after filtering: {len(filtered_us_videos)}")
     
@@ -500,8 +665,12 @@ def run_news_aggregator(config, output_dir="output/"):
     
     # Save results to JSON file
     json_file = os.path.join(output_dir, "latest_news.json")
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(filtered_videos, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open(json_file, 'wb') as f:
+            f.write(orjson.dumps(filtered_videos, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(filtered_videos, f, indent=2, ensure_ascii=False)
     
     print(f"Results saved to {json_file}")
     
@@ -509,9 +678,32 @@ def run_news_aggregator(config, output_dir="output/"):
     return filtered_videos
 
 
+def run(config, youtube=None):
+    """
+    Validate the configuration and run the aggregator in-process.
+    
+    Args:
+        config (dict): Configuration dictionary
+        youtube (optional): Existing YouTube API client to reuse
+        
+    Returns:
+        list: Selected videos, or None if the configuration is invalid
+    """
+    # Validate configuration
+    if not config.get("service_account_file"):
+        print("Error: Service account file path is required")
+        return None
+    
+    if not config.get("channels"):
+        print("Error: At least one YouTube channel ID is required")
+        return None
+    
+    return run_news_aggregator(config, config.get("output_dir", "output/"), youtube=youtube)
+
+
 def main():
     parser = argparse.ArgumentParser(description="YouTube News Aggregator")
-    parser.add_argument("--load-config", help="Path to the configuration file")
+    parser.add_argument("--load-config", help="Path to the configuration file ('-' reads it from stdin)")
     parser.add_argument("--service-account", help="Path to the service account JSON key file")
     parser.add_argument("--channels", nargs="+", help="YouTube channel IDs")
     parser.add_argument("--days-back", type=int, default=1, help="Number of days to look back")
@@ -526,8 +718,12 @@ def main():
     config = {}
     if args.load_config:
         try:
-            with open(args.load_config, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            if args.load_config == "-":
+                data = sys.stdin.buffer.read()
+            else:
+                with open(args.load_config, 'rb') as f:
+                    data = f.read()
+            config = orjson.loads(data) if orjson is not None else json.loads(data)
         except Exception as e:
             print(f"Error loading configuration file: {e}")
             return
@@ -544,20 +740,11 @@ def main():
     if args.max_videos_per_channel:
         config["max_videos_per_channel"] = args.max_videos_per_channel
     
-    # Validate configuration
-    if not config.get("service_account_file"):
-        print("Error: Service account file path is required")
-        return
-    
-    if not config.get("channels"):
-        print("Error: At least one YouTube channel ID is required")
-        return
-    
     # Determine output directory
-    output_dir = args.output_dir if args.output_dir else config.get("output_dir", "output/")
+    config["output_dir"] = args.output_dir if args.output_dir else config.get("output_dir", "output/")
     
     # Run the aggregator
-    run_news_aggregator(config, output_dir)
+    run(config)
 
 
 if __name__ == "__main__":
@@ -27,6 +27,12 @@ class VideoScoreCalculator:
             quality_keywords (list): List of keywords for thematic relevance scoring
         """
         self.quality_keywords = quality_keywords or []
+        
+        # Invariant per calculator: lowercase the keywords and compute the
+        # normalization once instead of for every video
+        # (assuming finding 20% of keywords is good enough for max score)
+        self._keywords_lower = tuple(keyword.lower() for keyword in self.quality_keywords)
+        self._max_expected_matches = max(1, len(self._keywords_lower) * 0.2)
     
     def calculate_scores(self, video_info):
         """
@@ -38,9 +44,14 @@ class VideoScoreCalculator:
         Returns:
             tuple: (quality_score, viral_score, total_score)
         """
+        # Metrics shared by both scores are looked up (and divided) only once
+        view_count = video_info.get('view_count', 0)
+        likes_per_view, comments_per_view = self._rates(video_info, view_count)
+        hours_since_published = video_info.get('hours_since_published', 24)
+        
         # Calculate base scores
-        quality_score = self.calculate_quality_score(video_info)
-        viral_score = self.calculate_viral_score(video_info)
+        quality_score = self._quality_score(video_info, likes_per_view, comments_per_view, hours_since_published)
+        viral_score = self._viral_score(view_count, likes_per_view, comments_per_view, hours_since_published)
         
         # Calculate total score - 70% quality score, 30% viral score
         total_score = (0.7 * quality_score) + (0.3 * viral_score)
@@ -65,24 +76,54 @@ class VideoScoreCalculator:
         Returns:
             float: Quality score (0-1 scale)
         """
-        # 1. Engagement Rate (25%)
+        likes_per_view, comments_per_view = self._rates(video_info, video_info.get('view_count', 0))
+        return self._quality_score(video_info, likes_per_view, comments_per_view,
+                                   video_info.get('hours_since_published', 24))
+    
+    def calculate_viral_score(self, video_info):
+        """
+        Calculate viral score (30% of total for US channels)
+        
+        Components:
+        - Views per hour (60%): (views_per_hour / 1000)
+        - Like-to-View ratio (25%): (Likes / Views) * 100
+        - Comment-to-View ratio (15%): (Comments / Views) * 100
+        
+        Args:
+            video_info (dict): Dictionary containing video metadata
+            
+        Returns:
+            float: Viral score (0-1 scale)
+        """
         view_count = video_info.get('view_count', 0)
-        engagement_rate = 0
+        likes_per_view, comments_per_view = self._rates(video_info, view_count)
+        return self._viral_score(view_count, likes_per_view, comments_per_view,
+                                 video_info.get('hours_since_published', 24))
+    
+    @staticmethod
+    def _rates(video_info, view_count):
+        """
+        Likes and comments per view, shared by the quality and viral scores
+        
+        Returns:
+            tuple: (likes_per_view, comments_per_view), both 0 for videos without views
+        """
         if view_count > 0:
-            engagement_rate = (video_info.get('like_count', 0) / view_count) * 10000
-            # Normalize to 0-1 scale (assuming 300 is a good engagement rate)
-            engagement_score = min(1.0, engagement_rate / 300)
-        else:
-            engagement_score = 0
+            return (video_info.get('like_count', 0) / view_count,
+                    video_info.get('comment_count', 0) / view_count)
+        return (0, 0)
+    
+    def _quality_score(self, video_info, likes_per_view, comments_per_view, hours_since_published):
+        """Quality score from already extracted rates; see calculate_quality_score."""
+        # 1. Engagement Rate (25%)
+        engagement_rate = likes_per_view * 10000
+        # Normalize to 0-1 scale (assuming 300 is a good engagement rate)
+        engagement_score = min(1.0, engagement_rate / 300)
         
         # 2. Comment Rate (15%)
-        comment_rate = 0
-        if view_count > 0:
-            comment_rate = (video_info.get('comment_count', 0) / view_count) * 10000
-            # Normalize to 0-1 scale (assuming 50 is a good comment rate)
-            comment_score = min(1.0, comment_rate / 50)
-        else:
-            comment_score = 0
+        comment_rate = comments_per_view * 10000
+        # Normalize to 0-1 scale (assuming 50 is a good comment rate)
+        comment_score = min(1.0, comment_rate / 50)
         
         # 3. Video Length Score (20%)
         duration_min = video_info.get('duration_seconds', 0) / 60
@@ -101,21 +142,20 @@ class VideoScoreCalculator:
         tags_score = min(1.0, tags_count / 10)  # Normalize to 0-1
         
         # Description length (60%)
-        desc_length = len(video_info.get('description', ''))
-        desc_score = min(1.0, desc_length / 1000)  # Normalize to 0-1
+        description = video_info.get('description', '')
+        desc_score = min(1.0, len(description) / 1000)  # Normalize to 0-1
         
         # Combined info depth score
         info_depth_score = (0.4 * tags_score) + (0.6 * desc_score)
         
         # 5. Recency (10%)
-        hours_since_published = video_info.get('hours_since_published', 24)
         # Higher score for newer videos (1.0 for just published, 0.0 for 24+ hours)
         recency_score = max(0, 1.0 - (hours_since_published / 24))
         
         # 6. Thematic Relevance (15%)
         thematic_score = self.calculate_thematic_relevance(
             video_info.get('title', ''),
-            video_info.get('description', '')
+            description
         )
         
         # Calculate weighted quality score
@@ -130,49 +170,23 @@ class VideoScoreCalculator:
         
         return quality_score
     
-    def calculate_viral_score(self, video_info):
-        """
-        Calculate viral score (30% of total for US channels)
-        
-        Components:
-        - Views per hour (60%): (views_per_hour / 1000)
-        - Like-to-View ratio (25%): (Likes / Views) * 100
-        - Comment-to-View ratio (15%): (Comments / Views) * 100
-        
-        Args:
-            video_info (dict): Dictionary containing video metadata
-            
-        Returns:
-            float: Viral score (0-1 scale)
-        """
-        # Extract required metrics
-        view_count = video_info.get('view_count', 0)
-        hours_since_published = max(1, video_info.get('hours_since_published', 24))
-        like_count = video_info.get('like_count', 0)
-        comment_count = video_info.get('comment_count', 0)
-        
+    @staticmethod
+    def _viral_score(view_count, likes_per_view, comments_per_view, hours_since_published):
+        """Viral score from already extracted rates; see calculate_viral_score."""
         # 1. Views per hour (60%)
-        views_per_hour = view_count / hours_since_published
+        views_per_hour = view_count / max(1, hours_since_published)
         # Normalize to 0-1 scale (assuming 1000 views/hour is viral)
         views_per_hour_score = min(1.0, views_per_hour / 1000)
         
         # 2. Like-to-View ratio (25%)
-        like_view_ratio = 0
-        if view_count > 0:
-            like_view_ratio = (like_count / view_count) * 100
-            # Normalize to 0-1 scale (assuming 5% is good)
-            like_view_score = min(1.0, like_view_ratio / 5)
-        else:
-            like_view_score = 0
+        like_view_ratio = likes_per_view * 100
+        # Normalize to 0-1 scale (assuming 5% is good)
+        like_view_score = min(1.0, like_view_ratio / 5)
         
         # 3. Comment-to-View ratio (15%)
-        comment_view_ratio = 0
-        if view_count > 0:
-            comment_view_ratio = (comment_count / view_count) * 100
-            # Normalize to 0-1 scale (assuming 1% is good)
-            comment_view_score = min(1.0, comment_view_ratio / 1)
-        else:
-            comment_view_score = 0
+        comment_view_ratio = comments_per_view * 100
+        # Normalize to 0-1 scale (assuming 1% is good)
+        comment_view_score = min(1.0, comment_view_ratio / 1)
         
         # Calculate weighted viral score
         viral_score = (
@@ -200,14 +214,16 @@ class VideoScoreCalculator:
         # Combine title and description for matching
         combined_text = (title + ' ' + description).lower()
         
-        # Count keyword matches
-        match_count = sum(1 for keyword in self.quality_keywords 
-                         if keyword.lower() in combined_text)
+        # Count keyword matches, stopping once the score is already saturated
+        match_count = 0
+        for keyword in self._keywords_lower:
+            if keyword in combined_text:
+                match_count += 1
+                if match_count >= self._max_expected_matches:
+                    break
         
-        # Normalize score (0-1)
-        # Assuming finding 20% of keywords is good enough for max score
-        max_expected_matches = max(1, len(self.quality_keywords) * 0.2)
-        relevance_score = min(1.0, match_count / max_expected_matches)
+        # Normalize score (0-1); still clamped since the expected count can be fractional
+        relevance_score = min(1.0, match_count / self._max_expected_matches)
         
         return relevance_score
 
@@ -14,13 +14,21 @@ Usage:
 
 import os
 import json
-import google.oauth2.service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 # Path to the service account credentials file
 DEFAULT_SERVICE_ACCOUNT_FILE = "config/service-account.json"
 
+# Socket timeout in seconds for YouTube API requests
+HTTP_TIMEOUT = 30
+
+# Retries for transient API errors (5xx, 429, rate-limit 403); googleapiclient
+# backs off exponentially with jitter between attempts
+API_NUM_RETRIES = 3
+
+# Service account credentials already loaded in this process, keyed by key file path
+_CREDENTIALS_CACHE = {}
+
 # Define the scopes required for YouTube API
 SCOPES = [
     'https://www.googleapis.com/auth/youtube',
@@ -28,6 +36,39 @@ SCOPES = [
     'https://www.googleapis.com/auth/youtube.readonly'
 ]
 
+def get_authorized_http(service_account_file=DEFAULT_SERVICE_ACCOUNT_FILE):
+    """
+    Create an authorized HTTP transport for the service account.
+    
+    httplib2 transports are not thread-safe; threads that share one YouTube client
+    can each pass their own transport to request.execute(http=...).
+    
+    Args:
+        service_account_file (str): Path to the service account JSON key file
+    
+    Returns:
+        google_auth_httplib2.AuthorizedHttp: Transport that attaches and refreshes the access token
+    """
+    # Imported here so that --help and early error exits don't pay for loading
+    # the transport stack
+    import httplib2
+    import google_auth_httplib2
+    import google.oauth2.service_account
+    
+    # Load service account credentials (once per key file; the transport refreshes tokens)
+    credentials = _CREDENTIALS_CACHE.get(service_account_file)
+    if credentials is None:
+        credentials = google.oauth2.service_account.Credentials.from_service_account_file(
+            service_account_file, 
+            scopes=SCOPES
+        )
+        _CREDENTIALS_CACHE[service_account_file] = credentials
+    
+    return google_auth_httplib2.AuthorizedHttp(
+        credentials,
+        http=httplib2.Http(timeout=HTTP_TIMEOUT)
+    )
+
 def get_youtube_client(service_account_file=DEFAULT_SERVICE_ACCOUNT_FILE):
     """
     Create an authenticated YouTube API client using service account credentials.
@@ -45,15 +86,17 @@ def get_youtube_client(service_account_file=DEFAULT_SERVICE_ACCOUNT_FILE):
     if not os.path.exists(service_account_file):
         raise FileNotFoundError(f"Service account file not found: {service_account_file}")
     
+    # Imported here so that --help and early error exits don't pay for loading
+    # the discovery stack
+    from googleapiclient.discovery import build
+    
     try:
-        # Load service account credentials
-        credentials = google.oauth2.service_account.Credentials.from_service_account_file(
-            service_account_file, 
-            scopes=SCOPES
-        )
+        # Authorized transport; attaches the access token and refreshes it when it expires
+        http = get_authorized_http(service_account_file)
         
-        # Build the YouTube API client
-        youtube = build('youtube', 'v3', credentials=credentials)
+        # Build the YouTube API client from the discovery document bundled with
+        # google-api-python-client, so startup doesn't need a network round trip
+        youtube = build('youtube', 'v3', http=http, static_discovery=True, cache_discovery=False)
         
         return youtube
     
@@ -75,18 +118,19 @@ def get_playlist_items(youtube, playlist_id, max_results=50):
     items = []
     
     try:
-        request = youtube.playlistItems().list(
+        playlist_items = youtube.playlistItems()
+        request = playlist_items.list(
             part="snippet,contentDetails",
             playlistId=playlist_id,
             maxResults=min(50, max_results)  # API limit is 50 per request
         )
         
         while request and len(items) < max_results:
-            response = request.execute()
+            response = request.execute(num_retries=API_NUM_RETRIES)
             items.extend(response.get("items", []))
             
             # Get the next page of results
-            request = youtube.playlistItems().list_next(request, response)
+            request = playlist_items.list_next(request, response)
             
             if len(items) >= max_results:
                 break
@@ -110,26 +154,39 @@ def clear_playlist(youtube, playlist_id):
     """
     items_removed = 0
     
+    def on_deleted(request_id, response, exception):
+        nonlocal items_removed
+        if exception is not None:
+            print(f"Error deleting playlist item: {exception}")
+        else:
+            items_removed += 1
+    
     try:
         # Get all playlist items
-        request = youtube.playlistItems().list(
+        playlist_items = youtube.playlistItems()
+        request = playlist_items.list(
             part="id",
             playlistId=playlist_id,
-            maxResults=50
+            maxResults=50,
+            fields="nextPageToken,items/id"
         )
         
+        # Collect every item before deleting anything: deleting while paging
+        # shifts the remaining items, so the next page would skip some of them
+        item_ids = []
         while request:
-            response = request.execute()
-            
-            # Delete each item
-            for item in response.get("items", []):
-                youtube.playlistItems().delete(
-                    id=item["id"]
-                ).execute()
-                items_removed += 1
+            response = request.execute(num_retries=API_NUM_RETRIES)
+            item_ids.extend(item["id"] for item in response.get("items", []))
             
             # Get the next page of results
-            request = youtube.playlistItems().list_next(request, response)
+            request = playlist_items.list_next(request, response)
+        
+        # Delete in batched HTTP requests of at most 50 calls (the batch limit)
+        for i in range(0, len(item_ids), 50):
+            batch = youtube.new_batch_http_request(callback=on_deleted)
+            for item_id in item_ids[i:i+50]:
+                batch.add(playlist_items.delete(id=item_id))
+            batch.execute()
         
         return items_removed
     
@@ -151,6 +208,8 @@ def add_video_to_playlist(youtube, playlist_id, video_id, position=0):
         bool: True if successful, False otherwise
     """
     try:
+        # No retries: insert is not idempotent, and a retry after a lost response
+        # would add the video twice
         youtube.playlistItems().insert(
             part="snippet",
             body={
@@ -192,8 +251,9 @@ if __name__ == "__main__":
             # Get playlist info
             playlist_response = youtube.playlists().list(
                 part="snippet",
-                id=playlist_id
-            ).execute()
+                id=playlist_id,
+                fields="items/snippet/title"
+            ).execute(num_retries=API_NUM_RETRIES)
             
             if playlist_response.get("items"):
                 playlist = playlist_response["items"][0]
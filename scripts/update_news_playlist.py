@@ -5,24 +5,34 @@ YouTube News Playlist Updater
 
 Dieses Skript aktualisiert eine bestehende YouTube-Playlist mit den neuesten Nachrichtenvideos:
 1. Liest die Playlist-ID aus der Konfigurationsdatei
-2. Löscht den Inhalt der Playlist (behält die Playlist selbst)
-3. Liest die Videos aus der latest_news.json Datei
-4. Sortiert sie nach Erscheinungsdatum (neueste zuerst)
-5. Fügt die Videos in dieser Reihenfolge zur Playlist hinzu
+2. Liest die Videos aus der latest_news.json Datei
+3. Sortiert sie nach Erscheinungsdatum (neueste zuerst)
+4. Gleicht die Playlist mit dieser Reihenfolge ab (behält die Playlist selbst):
+   nicht mehr benötigte Einträge werden gelöscht, vorhandene verschoben und
+   nur neue Videos eingefügt
 """
 
 import os
+import sys
 import json
 import argparse
-from datetime import datetime
 from googleapiclient.errors import HttpError
 
+# orjson ist optional; ohne orjson wird die Standardbibliothek verwendet
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import service account authentication
-from service_account_auth import get_youtube_client
+from service_account_auth import API_NUM_RETRIES, get_youtube_client
 
 def update_news_playlist(json_file="output/latest_news.json", 
                          service_account_file="config/service-account.json",
-                         playlist_id_file="config/playlist_id.txt"):
+                         playlist_id_file="config/playlist_id.txt",
+                         youtube=None,
+                         show_stats=False,
+                         verbose=False):
     """
     Aktualisiert eine bestehende YouTube-Playlist mit den neuesten Nachrichtenvideos.
     
@@ -30,6 +40,9 @@ def update_news_playlist(json_file="output/latest_news.json",
         json_file (str): Pfad zur JSON-Datei mit den Videoinformationen
         service_account_file (str): Pfad zur Service Account JSON-Datei
         playlist_id_file (str): Pfad zur Datei mit der Playlist-ID
+        youtube (optional): Bereits authentifizierter YouTube-API-Client, der wiederverwendet wird
+        show_stats (bool): Titel und Anzahl der Videos der Playlist abfragen und ausgeben
+        verbose (bool): Jedes hinzugefügte Video einzeln ausgeben
     
     Returns:
         bool: True bei Erfolg, False bei Fehler
@@ -52,8 +65,9 @@ def update_news_playlist(json_file="output/latest_news.json",
     
     # 2. Videodaten aus JSON-Datei laden
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            videos = json.load(f)
+        with open(json_file, 'rb') as f:
+            data = f.read()
+        videos = orjson.loads(data) if orjson is not None else json.loads(data)
             
         if not videos:
             print("Keine Videos in der JSON-Datei gefunden.")
@@ -64,89 +78,185 @@ def update_news_playlist(json_file="output/latest_news.json",
         print(f"Fehler beim Laden der JSON-Datei: {e}")
         return False
     
-    # 3. Mit Service Account bei YouTube API authentifizieren
-    try:
-        youtube = get_youtube_client(service_account_file)
-        print("Erfolgreich bei YouTube API authentifiziert.")
-    except Exception as e:
-        print(f"Fehler bei der Authentifizierung: {e}")
-        return False
+    # 3. Mit Service Account bei YouTube API authentifizieren (sofern kein Client übergeben wurde)
+    if youtube is None:
+        try:
+            youtube = get_youtube_client(service_account_file)
+            print("Erfolgreich bei YouTube API authentifiziert.")
+        except Exception as e:
+            print(f"Fehler bei der Authentifizierung: {e}")
+            return False
+    
+    # 4. Videos nach Erscheinungsdatum sortieren (neueste zuerst)
+    # Die ISO-8601-Zeitangaben der API ("YYYY-MM-DDTHH:MM:SSZ", immer UTC) sind
+    # lexikographisch sortierbar, daher wird direkt nach dem String sortiert.
+    # Videos ohne Veröffentlichungsdatum landen am Ende.
+    videos.sort(key=lambda video: video.get('published_at') or '', reverse=True)
+    print("Videos nach Erscheinungsdatum sortiert (neueste zuerst).")
     
-    # 4. Vorhandene Videos aus der Playlist löschen
+    # Jedes Video nur einmal in die Playlist aufnehmen (erstes Vorkommen zählt)
+    unique_videos = {}
+    for video in videos:
+        unique_videos.setdefault(video['id'], video)
+    videos = list(unique_videos.values())
+    desired_ids = [video['id'] for video in videos]
+    
+    # 5. Aktuellen Inhalt der Playlist lesen
     try:
-        items_deleted = 0
-        request = youtube.playlistItems().list(
-            part="id",
+        current_items = []  # (playlistItem-ID, Video-ID) in Playlist-Reihenfolge
+        playlist_items = youtube.playlistItems()
+        request = playlist_items.list(
+            part="snippet",
             playlistId=playlist_id,
-            maxResults=50
+            maxResults=50,
+            fields="nextPageToken,items(id,snippet/resourceId/videoId)"
         )
         
         while request:
-            response = request.execute()
-            
-            # Jeden Eintrag löschen
+            response = request.execute(num_retries=API_NUM_RETRIES)
             for item in response.get("items", []):
-                youtube.playlistItems().delete(
-                    id=item["id"]
-                ).execute()
-                items_deleted += 1
+                current_items.append((item["id"], item["snippet"]["resourceId"]["videoId"]))
             
             # Nächste Seite mit Ergebnissen
-            request = youtube.playlistItems().list_next(request, response)
-        
-        print(f"{items_deleted} Videos aus der Playlist entfernt.")
+            request = playlist_items.list_next(request, response)
     except HttpError as e:
-        print(f"Fehler beim Löschen der Playlist-Einträge: {e}")
+        print(f"Fehler beim Lesen der Playlist-Einträge: {e}")
         return False
     
-    # 5. Videos nach Erscheinungsdatum sortieren (neueste zuerst)
+    # 6. Playlist abgleichen (nur die tatsächlichen Änderungen schreiben)
+    if [video_id for _, video_id in current_items] == desired_ids:
+        print("Playlist ist bereits aktuell, keine Änderungen nötig.")
+    elif not _sync_playlist(youtube, playlist_id, current_items, videos, verbose):
+        return False
+    
+    # 7. Playlist-Informationen ausgeben (kostet einen weiteren API-Aufruf, daher optional)
+    if not show_stats:
+        print(f"\nPlaylist-URL: https://www.youtube.com/playlist?list={playlist_id}")
+        return True
+    
     try:
-        # Umwandeln der ISO-8601 Zeitangaben in datetime-Objekte für die Sortierung
-        for video in videos:
-            if 'published_at' in video:
-                # Standardisierte ISO-8601-Zeitangabe in datetime-Objekt umwandeln
-                published_at = video['published_at'].replace('Z', '+00:00')
-                video['_published_datetime'] = datetime.fromisoformat(published_at)
-            else:
-                # Fallback, wenn kein Veröffentlichungsdatum vorhanden ist
-                video['_published_datetime'] = datetime.min
-        
-        # Nach Datum sortieren (neueste zuerst)
-        videos.sort(key=lambda x: x['_published_datetime'], reverse=True)
+        playlist_response = youtube.playlists().list(
+            part="snippet,contentDetails",
+            id=playlist_id,
+            fields="items(snippet/title,contentDetails/itemCount)"
+        ).execute(num_retries=API_NUM_RETRIES)
         
-        print("Videos nach Erscheinungsdatum sortiert (neueste zuerst).")
-    except Exception as e:
-        print(f"Fehler beim Sortieren der Videos: {e}")
-        # Fortfahren, auch wenn die Sortierung fehlschlägt
+        if playlist_response.get("items"):
+            playlist = playlist_response["items"][0]
+            print("\nPlaylist-Informationen:")
+            print(f"Titel: {playlist['snippet']['title']}")
+            print(f"Anzahl Videos: {playlist['contentDetails']['itemCount']}")
+            print(f"URL: https://www.youtube.com/playlist?list={playlist_id}")
+    except HttpError as e:
+        print(f"Fehler beim Abrufen der Playlist-Informationen: {e}")
+    
+    return True
+
+def _sync_playlist(youtube, playlist_id, current_items, videos, verbose=False):
+    """
+    Bringt die Playlist mit möglichst wenigen API-Aufrufen in die gewünschte Reihenfolge.
+    
+    Nicht mehr benötigte Einträge werden gelöscht, vorhandene Videos bei Bedarf
+    verschoben und nur fehlende Videos neu eingefügt.
+    
+    Args:
+        youtube: Authentifizierter YouTube-API-Client
+        playlist_id (str): ID der Playlist
+        current_items (list): (playlistItem-ID, Video-ID)-Paare in Playlist-Reihenfolge
+        videos (list): Gewünschte Videos in Zielreihenfolge (ohne Duplikate)
+        verbose (bool): Jedes hinzugefügte Video einzeln ausgeben
+    
+    Returns:
+        bool: True bei (Teil-)Erfolg, False bei Fehler
+    """
+    # Ressource einmal auflösen statt bei jedem Aufruf
+    playlist_items = youtube.playlistItems()
+    desired_ids = {video['id'] for video in videos}
+    
+    # Einträge behalten, deren Video weiterhin gewünscht ist (Duplikate nur einmal)
+    kept_items = {}
+    obsolete_items = []
+    for item_id, video_id in current_items:
+        if video_id in desired_ids and video_id not in kept_items:
+            kept_items[video_id] = item_id
+        else:
+            obsolete_items.append(item_id)
+    
+    # 6a. Nicht mehr benötigte Einträge löschen (je 50 in einem Batch-Request)
+    items_deleted = 0
+    delete_errors = []
+    
+    def on_deleted(request_id, response, exception):
+        nonlocal items_deleted
+        if exception is not None:
+            delete_errors.append(exception)
+        else:
+            items_deleted += 1
     
-    # 6. Videos zur Playlist hinzufügen
     try:
-        videos_added = 0
+        for i in range(0, len(obsolete_items), 50):
+            batch = youtube.new_batch_http_request(callback=on_deleted)
+            for item_id in obsolete_items[i:i + 50]:
+                batch.add(playlist_items.delete(id=item_id))
+            batch.execute()
+            
+            if delete_errors:
+                raise delete_errors[0]
         
-        for video in videos:
+        print(f"{items_deleted} Videos aus der Playlist entfernt.")
+    except HttpError as e:
+        print(f"Fehler beim Löschen der Playlist-Einträge: {e}")
+        return False
+    
+    # 6b. Videos an ihre Position verschieben bzw. fehlende Videos einfügen
+    # playlist spiegelt die Reihenfolge in der Playlist nach jedem Aufruf wider
+    playlist = [video_id for item_id, video_id in current_items if kept_items.get(video_id) == item_id]
+    videos_added = 0
+    videos_moved = 0
+    
+    try:
+        for position, video in enumerate(videos):
             video_id = video['id']
             
-            youtube.playlistItems().insert(
-                part="snippet",
-                body={
-                    "snippet": {
-                        "playlistId": playlist_id,
-                        "resourceId": {
-                            "kind": "youtube#video",
-                            "videoId": video_id
-                        },
-                        # Position exakt setzen, damit die Reihenfolge stimmt
-                        "position": videos_added
-                    }
-                }
-            ).execute()
+            # Steht das Video bereits an der richtigen Stelle, ist nichts zu tun
+            if position < len(playlist) and playlist[position] == video_id:
+                continue
             
-            videos_added += 1
+            snippet = {
+                "playlistId": playlist_id,
+                "resourceId": {
+                    "kind": "youtube#video",
+                    "videoId": video_id
+                },
+                # Position exakt setzen, damit die Reihenfolge stimmt
+                "position": position
+            }
             
-            # Optionale Ausgabe für jedes hinzugefügte Video
-            print(f"Video hinzugefügt: {video.get('title', video_id)} (veröffentlicht am {video.get('published_at', 'unbekannt')})")
+            if video_id in kept_items:
+                # Vorhandenen Eintrag verschieben statt löschen und neu einfügen
+                playlist_items.update(
+                    part="snippet",
+                    body={"id": kept_items[video_id], "snippet": snippet}
+                ).execute(num_retries=API_NUM_RETRIES)
+                playlist.remove(video_id)
+                videos_moved += 1
+            else:
+                # Ohne Wiederholungen: insert ist nicht idempotent, ein erneuter
+                # Versuch nach verlorener Antwort würde das Video doppelt einfügen
+                playlist_items.insert(
+                    part="snippet",
+                    body={"snippet": snippet}
+                ).execute()
+                videos_added += 1
+                
+                # Optionale Ausgabe für jedes hinzugefügte Video
+                if verbose:
+                    print(f"Video hinzugefügt: {video.get('title', video_id)} (veröffentlicht am {video.get('published_at', 'unbekannt')})")
+            
+            playlist.insert(position, video_id)
         
         print(f"Insgesamt {videos_added} Videos zur Playlist hinzugefügt.")
+        print(f"{videos_moved} Videos verschoben, {len(videos) - videos_added - videos_moved} unverändert.")
     except HttpError as e:
         print(f"Fehler beim Hinzufügen von Videos zur Playlist: {e}")
         # Teilerfolg, wenn einige Videos hinzugefügt wurden
@@ -155,22 +265,6 @@ def update_news_playlist(json_file="output/latest_news.json",
             return True
         return False
     
-    # 7. Playlist-Informationen ausgeben
-    try:
-        playlist_response = youtube.playlists().list(
-            part="snippet,contentDetails",
-            id=playlist_id
-        ).execute()
-        
-        if playlist_response.get("items"):
-            playlist = playlist_response["items"][0]
-            print("\nPlaylist-Informationen:")
-            print(f"Titel: {playlist['snippet']['title']}")
-            print(f"Anzahl Videos: {playlist['contentDetails']['itemCount']}")
-            print(f"URL: https://www.youtube.com/playlist?list={playlist_id}")
-    except HttpError as e:
-        print(f"Fehler beim Abrufen der Playlist-Informationen: {e}")
-    
     return True
 
 if __name__ == "__main__":
@@ -181,20 +275,37 @@ if __name__ == "__main__":
                        help="Pfad zur Service Account JSON-Datei")
     parser.add_argument("--playlist-id-file", default="config/playlist_id.txt",
                        help="Pfad zur Datei mit der Playlist-ID")
+    parser.add_argument("--show-stats", action="store_true",
+                       help="Titel und Anzahl der Videos der Playlist ausgeben")
     parser.add_argument("--verbose", action="store_true",
                        help="Ausführliche Ausgabe")
     
     args = parser.parse_args()
     
-    success = update_news_playlist(
-        json_file=args.json_file,
-        service_account_file=args.service_account,
-        playlist_id_file=args.playlist_id_file
-    )
+    # Client hier erzeugen, damit er nach der Aktualisierung geschlossen werden kann
+    try:
+        youtube = get_youtube_client(args.service_account)
+        print("Erfolgreich bei YouTube API authentifiziert.")
+    except Exception as e:
+        print(f"Fehler bei der Authentifizierung: {e}")
+        sys.exit(1)
+    
+    try:
+        success = update_news_playlist(
+            json_file=args.json_file,
+            service_account_file=args.service_account,
+            playlist_id_file=args.playlist_id_file,
+            youtube=youtube,
+            show_stats=args.show_stats,
+            verbose=args.verbose
+        )
+    finally:
+        # Verbindungen sofort freigeben statt beim Beenden auf den Garbage Collector zu warten
+        youtube.close()
     
     if success:
         print("Playlist-Aktualisierung erfolgreich abgeschlossen.")
-        exit(0)
+        sys.exit(0)
     else:
         print("Playlist-Aktualisierung fehlgeschlagen.")
-        exit(1)
\ No newline at end of file
+        sys.exit(1)
\ No newline at end of file